@@ -70,18 +70,17 @@ def main():
         output_dir = Path("output")
         output_dir.mkdir(exist_ok=True)
         
+        output_file = output_dir / "roster_output.xlsx"
         generator = ExcelGenerator()
-        wb = generator.generate_output(
+        generator.generate_output(
             assignments,
             data,
             optimizer.mechanic_skills,
             optimizer.mechanic_inspector_skills,
             optimizer.inspector_req_columns,
             data["base_schedule_df"],
+            output=str(output_file),
         )
-        
-        output_file = output_dir / "roster_output.xlsx"
-        wb.save(output_file)
         print(f"Excel file saved to: {output_file}")
     else:
         print(f"Optimization failed with status: {status}")
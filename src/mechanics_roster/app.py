@@ -12,6 +12,8 @@ if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
 import io
+import os
+import tempfile
 from datetime import datetime
 
 import pandas as pd
@@ -59,6 +61,31 @@ st.markdown(
 )
 
 
+@st.cache_data(show_spinner=False)
+def load_data_cached(mechanic_skills_bytes, base_schedule_bytes, cost_matrix_bytes, avoidance_list_bytes=None):
+    """
+    Load input data from raw file bytes, memoized by Streamlit.
+
+    The cache key is the file content, so re-running the optimization with
+    unchanged uploads skips Excel parsing entirely.
+
+    Args:
+        mechanic_skills_bytes: Contents of the mechanic skills dataset
+        base_schedule_bytes: Contents of the base aircraft schedule
+        cost_matrix_bytes: Contents of the cost matrix
+        avoidance_list_bytes: Optional contents of the avoidance list
+
+    Returns:
+        dict: Dictionary containing all processed data
+    """
+    return DataLoader(cache_dir=Config.instance().cache_dir).load_data(
+        io.BytesIO(mechanic_skills_bytes),
+        io.BytesIO(base_schedule_bytes),
+        io.BytesIO(cost_matrix_bytes),
+        io.BytesIO(avoidance_list_bytes) if avoidance_list_bytes is not None else None,
+    )
+
+
 def main():
     """Main Streamlit app."""
     st.markdown(
@@ -92,6 +119,35 @@ def main():
         help="Upload avoidance_list.xlsx (optional)",
     )
 
+    st.sidebar.header("⚙️ Solver Settings")
+
+    time_limit = st.sidebar.slider(
+        "Time Limit (seconds)",
+        min_value=10,
+        max_value=600,
+        value=60,
+        step=10,
+        help="Stop the solver after this long and keep the best solution found",
+    )
+
+    cpu_count = os.cpu_count() or 1
+    num_threads = st.sidebar.number_input(
+        "Solver Threads",
+        min_value=1,
+        max_value=cpu_count,
+        value=max(1, cpu_count // 2),
+        help="Number of threads the solver may use",
+    )
+
+    mip_gap = st.sidebar.slider(
+        "Relative MIP Gap (%)",
+        min_value=0.0,
+        max_value=10.0,
+        value=1.0,
+        step=0.5,
+        help="Stop once the solution is proven within this percentage of optimal",
+    )
+
     if st.sidebar.button("🚀 Run Optimization", type="primary"):
         if not all([mechanic_skills_file, base_schedule_file, cost_matrix_file]):
             st.error(
@@ -105,13 +161,12 @@ def main():
                 # Load data
                 status_text.text("📥 Loading data files...")
                 progress_bar.progress(0.1)
-                data_loader = DataLoader()
-                config = Config()
-                data = data_loader.load_data(
-                    mechanic_skills_file,
-                    base_schedule_file,
-                    cost_matrix_file,
-                    avoidance_list_file,
+                config = Config.instance()
+                data = load_data_cached(
+                    mechanic_skills_file.getvalue(),
+                    base_schedule_file.getvalue(),
+                    cost_matrix_file.getvalue(),
+                    avoidance_list_file.getvalue() if avoidance_list_file is not None else None,
                 )
                 progress_bar.progress(0.3)
 
@@ -149,14 +204,17 @@ def main():
                         st.write(f"**Constraints:** {solver.NumConstraints()}")
                     with col2:
                         st.write(f"**Solver:** {solver.SolverVersion()}")
-                        if data["avoidance_dict"]:
-                            unique_pairs = {(min(k), max(k)) for k in data["avoidance_dict"].keys()}
-                            st.write(f"**Avoidance Pairs:** {len(unique_pairs)}")
+                        if data["avoidance_pairs"]:
+                            st.write(f"**Avoidance Pairs:** {len(data['avoidance_pairs'])}")
 
                 # Solve
                 status_text.text("🔄 Solving optimization problem...")
                 progress_bar.progress(0.8)
-                status, solve_time = optimizer.solve()
+                status, solve_time = optimizer.solve(
+                    time_limit_seconds=time_limit,
+                    num_threads=int(num_threads),
+                    relative_gap=mip_gap / 100,
+                )
                 progress_bar.progress(1.0)
 
                 if status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
@@ -170,19 +228,7 @@ def main():
                         data["cost_dict"],
                     )
 
-                    # Avoidance penalties
-                    total_avoidance_penalty = 0
-                    if data["avoidance_dict"] and avoidance_vars:
-                        unique_pairs = {(m1, m2) for (m1, m2) in data["avoidance_dict"].keys() if m1 < m2}
-                        for m1, m2 in unique_pairs:
-                            penalty = data["avoidance_dict"][(m1, m2)]
-                            for b in data["bases"]:
-                                for g in data["periods"]:
-                                    for s in data["shifts"]:
-                                        key = (m1, m2, b, g, s)
-                                        if key in avoidance_vars and avoidance_vars[key].solution_value() > 0.5:
-                                            total_avoidance_penalty += penalty
-
+                    total_avoidance_penalty = optimizer.extract_avoidance_penalty(assignments)
                     objective_value = solver.Objective().Value()
 
                     st.success("✅ Optimization completed successfully!")
@@ -212,29 +258,31 @@ def main():
 
                     # Excel generation
                     status_text.text("📝 Generating Excel output...")
+                    # The workbook is streamed to a temporary file and handed to the download
+                    # button as an open handle, instead of being assembled in a BytesIO
                     excel_generator = ExcelGenerator()
-                    wb = excel_generator.generate_output(
-                        assignments,
-                        data,
-                        mechanic_skills,
-                        mechanic_inspector_skills,
-                        inspector_req_columns,
-                        data["base_schedule_df"],
-                    )
-
-                    output = io.BytesIO()
-                    wb.save(output)
-                    output.seek(0)
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        output_path = Path(tmp_dir) / "roster_output.xlsx"
+                        excel_generator.generate_output(
+                            assignments,
+                            data,
+                            mechanic_skills,
+                            mechanic_inspector_skills,
+                            inspector_req_columns,
+                            data["base_schedule_df"],
+                            output=str(output_path),
+                        )
 
-                    status_text.text("✅ Ready for download!")
-                    progress_bar.empty()
+                        status_text.text("✅ Ready for download!")
+                        progress_bar.empty()
 
-                    st.download_button(
-                        label="📥 Download Roster Output (Excel)",
-                        data=output,
-                        file_name=f"roster_output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    )
+                        with open(output_path, "rb") as output:
+                            st.download_button(
+                                label="📥 Download Roster Output (Excel)",
+                                data=output,
+                                file_name=f"roster_output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            )
 
                     with st.expander("📋 View Assignments", expanded=False):
                         assignments_df = pd.DataFrame(assignments)
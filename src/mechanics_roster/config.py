@@ -2,6 +2,7 @@
 Configuration management module.
 """
 
+import functools
 import logging
 import os
 from pathlib import Path
@@ -9,6 +10,8 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+_LOGGING_INITIALIZED = False
+
 
 class Config:
     """Application configuration."""
@@ -17,19 +20,23 @@ class Config:
     DEFAULT_SOLVER = "SCIP"
     DEFAULT_LOG_LEVEL = "INFO"
     DEFAULT_DATA_DIR = "data"
+    DEFAULT_CACHE_DIR = ".cache/xlsx"
 
     def __init__(self):
         """Initialize configuration from environment variables or defaults."""
         self.solver = os.getenv("SOLVER", self.DEFAULT_SOLVER)
         self.log_level = os.getenv("LOG_LEVEL", self.DEFAULT_LOG_LEVEL)
         self.data_dir = Path(os.getenv("DATA_DIR", self.DEFAULT_DATA_DIR))
+        # Parsed input workbooks are cached here unless NO_CACHE is set
+        no_cache = os.getenv("NO_CACHE", "").lower() in ("1", "true", "yes")
+        self.cache_dir = None if no_cache else Path(os.getenv("CACHE_DIR", self.DEFAULT_CACHE_DIR))
 
         # Validate
         self._validate()
 
     def _validate(self):
         """Validate configuration values."""
-        valid_solvers = ["SCIP", "CBC", "GLOP"]
+        valid_solvers = ["SCIP", "CBC", "GLOP", "CP_SAT", "HIGHS"]
         if self.solver not in valid_solvers:
             logger.warning(f"Invalid solver {self.solver}, defaulting to {self.DEFAULT_SOLVER}")
             self.solver = self.DEFAULT_SOLVER
@@ -39,17 +46,32 @@ class Config:
             logger.warning(f"Invalid log level {self.log_level}, defaulting to {self.DEFAULT_LOG_LEVEL}")
             self.log_level = self.DEFAULT_LOG_LEVEL
 
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def instance(cls):
+        """
+        Get the shared configuration, read from the environment on first use.
+
+        Returns:
+            Config: Process-wide configuration instance
+        """
+        return cls()
+
     @classmethod
     def setup_logging(cls, log_level: Optional[str] = None):
         """
-        Setup logging configuration.
+        Setup logging configuration. Only the first call has an effect.
 
         Args:
             log_level: Logging level (defaults to config value)
         """
+        global _LOGGING_INITIALIZED
+        if _LOGGING_INITIALIZED:
+            return
+        _LOGGING_INITIALIZED = True
+
         if log_level is None:
-            config = cls()
-            log_level = config.log_level
+            log_level = cls.instance().log_level
 
         logging.basicConfig(
             level=getattr(logging, log_level),
@@ -2,19 +2,114 @@
 Data loading and processing module for mechanics roster optimization.
 """
 
+import hashlib
+import io
 import logging
+import os
+import tempfile
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Prefer the Rust-based calamine reader (pandas >= 2.2); pandas' openpyxl reader,
+# which opens workbooks read-only, is the fallback
+try:
+    import python_calamine  # noqa: F401
+
+    _HAS_CALAMINE = tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2)
+except ImportError:
+    _HAS_CALAMINE = False
+
+EXCEL_ENGINE = "calamine" if _HAS_CALAMINE else "openpyxl"
+
+
+def _parse_excel(source):
+    """
+    Parse the first sheet of a workbook with EXCEL_ENGINE.
+
+    Workbooks calamine cannot read are retried with openpyxl.
+
+    Args:
+        source: Path or file-like object for the workbook
+
+    Returns:
+        pd.DataFrame: Contents of the first sheet
+    """
+    if EXCEL_ENGINE == "calamine":
+        try:
+            return pd.read_excel(source, engine="calamine")
+        except Exception as e:
+            logger.warning(f"calamine could not read workbook, retrying with openpyxl: {e}")
+            if hasattr(source, "seek"):
+                source.seek(0)
+    return pd.read_excel(source, engine="openpyxl")
+
 
 class DataLoader:
     """Handles loading and processing of input data files."""
 
-    def __init__(self):
-        """Initialize the DataLoader."""
+    def __init__(self, cache_dir=None):
+        """
+        Initialize the DataLoader.
+
+        Args:
+            cache_dir: Optional directory for caching parsed workbooks, keyed by the
+                SHA-256 of their bytes (default: no caching)
+        """
         self.base_column_mapping = {"A": 1, "B": 2, "C": 3}
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    def _read_excel(self, file):
+        """
+        Read an Excel file, reusing a cached DataFrame for identical file contents.
+
+        The cache key covers the file bytes, the pandas version and EXCEL_ENGINE, since
+        both change the parsed frame. An entry that cannot be read is treated as a miss
+        and rewritten; entries are written to a temporary file and moved into place, so a
+        concurrent reader never sees a partial pickle.
+
+        Args:
+            file: Path or file-like object for the workbook
+
+        Returns:
+            pd.DataFrame: Contents of the first sheet
+        """
+        if self.cache_dir is None:
+            return _parse_excel(file)
+
+        if hasattr(file, "read"):
+            buffer = file.read()
+            file.seek(0)
+        else:
+            buffer = Path(file).read_bytes()
+
+        key = hashlib.sha256(buffer)
+        key.update(f"pandas={pd.__version__};engine={EXCEL_ENGINE}".encode())
+        cache_file = self.cache_dir / f"{key.hexdigest()}.pkl"
+        if cache_file.exists():
+            try:
+                df = pd.read_pickle(cache_file)
+                logger.debug(f"Using cached workbook {cache_file.name}")
+                return df
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable workbook cache {cache_file.name}: {e}")
+
+        df = _parse_excel(io.BytesIO(buffer))
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp_file:
+                df.to_pickle(tmp_file)
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not write workbook cache: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return df
 
     def load_data(self, mechanic_skills_file, base_schedule_file, cost_matrix_file, avoidance_list_file=None):
         """
@@ -33,17 +128,17 @@ class DataLoader:
 
         # Load mechanic skills dataset
         logger.info("Loading mechanic skills dataset")
-        mechanic_skills_df = pd.read_excel(mechanic_skills_file)
+        mechanic_skills_df = self._read_excel(mechanic_skills_file)
         mechanics = sorted(mechanic_skills_df["mechanic_id"].unique().tolist())
         data["mechanic_skills_df"] = mechanic_skills_df
         data["mechanics"] = mechanics
 
         # Load base aircraft schedule
         logger.info("Loading base aircraft schedule")
-        base_schedule_df = pd.read_excel(base_schedule_file)
-        bases = sorted(base_schedule_df["base_id"].unique().tolist())
-        periods = sorted(base_schedule_df["period"].unique().tolist())
-        shifts = sorted(base_schedule_df["shift"].unique().tolist())
+        base_schedule_df = self._read_excel(base_schedule_file)
+        # One pass down to the distinct cells; the per-column uniques then scan only those
+        cells = base_schedule_df[["base_id", "period", "shift"]].drop_duplicates()
+        bases, periods, shifts = (sorted(cells[col].unique().tolist()) for col in ("base_id", "period", "shift"))
         data["base_schedule_df"] = base_schedule_df
         data["bases"] = bases
         data["periods"] = periods
@@ -51,15 +146,24 @@ class DataLoader:
 
         # Load cost matrix
         logger.info("Loading cost matrix")
-        cost_matrix_df = pd.read_excel(cost_matrix_file)
-        cost_dict = {}
-        for _, row in cost_matrix_df.iterrows():
-            mechanic_id = int(row["id"])
-            for col, base_id in self.base_column_mapping.items():
-                if col in cost_matrix_df.columns:
-                    cost_dict[(mechanic_id, base_id)] = float(row[col])
-        data["cost_matrix_df"] = cost_matrix_df
+        cost_matrix_df = self._read_excel(cost_matrix_file)
+        base_columns = [col for col in self.base_column_mapping if col in cost_matrix_df.columns]
+        costs = cost_matrix_df.melt(id_vars="id", value_vars=base_columns, var_name="base_col", value_name="cost")
+        cost_mechanics = costs["id"].to_numpy(dtype=np.int64)
+        cost_bases = costs["base_col"].map(self.base_column_mapping).to_numpy(dtype=np.int64)
+        cost_values = costs["cost"].to_numpy(dtype=np.float64)
+        cost_dict = dict(zip(zip(cost_mechanics.tolist(), cost_bases.tolist()), cost_values.tolist()))
+
+        # Dense cost matrix aligned with data["mechanics"] x data["bases"]; missing pairs cost 0
+        cost_array = np.zeros((len(mechanics), len(bases)), dtype=np.float64)
+        m_idx = pd.Index(mechanics).get_indexer(cost_mechanics)
+        b_idx = pd.Index(bases).get_indexer(cost_bases)
+        known = (m_idx >= 0) & (b_idx >= 0)
+        cost_array[m_idx[known], b_idx[known]] = cost_values[known]
+
+        # The raw cost matrix is not kept: cost_dict and cost_array carry everything downstream needs
         data["cost_dict"] = cost_dict
+        data["cost_array"] = cost_array
         data["base_column_mapping"] = self.base_column_mapping
 
         # Load avoidance list (optional)
@@ -67,16 +171,16 @@ class DataLoader:
         if avoidance_list_file is not None:
             try:
                 logger.info("Loading avoidance list")
-                avoidance_df = pd.read_excel(avoidance_list_file)
-                for _, row in avoidance_df.iterrows():
-                    m1 = int(row["mechanic_id"])
-                    m2 = int(row["avoid_mechanic_id"])
-                    penalty = float(row["penalty"])
-                    avoidance_dict[(m1, m2)] = penalty
-                    avoidance_dict[(m2, m1)] = penalty
+                avoidance_df = self._read_excel(avoidance_list_file)
+                pairs = avoidance_df[["mechanic_id", "avoid_mechanic_id"]].to_numpy(dtype=np.int64)
+                penalties = avoidance_df["penalty"].to_numpy(dtype=np.float64)
+                # Each row sets both directions; interleaving them keeps the last row winning for both
+                both_directions = np.stack([pairs, pairs[:, ::-1]], axis=1).reshape(-1, 2)
+                avoidance_dict = dict(zip(map(tuple, both_directions.tolist()), np.repeat(penalties, 2).tolist()))
             except Exception as e:
                 logger.warning(f"Could not load avoidance list: {e}")
         data["avoidance_dict"] = avoidance_dict
+        data["avoidance_pairs"] = sorted((m1, m2) for m1, m2 in avoidance_dict if m1 < m2)
 
         logger.info(
             f"Loaded data: {len(mechanics)} mechanics, {len(bases)} bases, " f"{len(periods)} periods, {len(shifts)} shifts"
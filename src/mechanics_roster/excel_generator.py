@@ -2,15 +2,26 @@
 Excel output generation module.
 """
 
+import io
 import logging
+from collections import defaultdict
 
+import numpy as np
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
+import xlsxwriter
 
 logger = logging.getLogger(__name__)
 
+CHECKED = "☑"
+UNCHECKED = "☐"
+
+# 30-day on-duty grid per group: group 1 works days 1-15, group 2 days 16-30
+DAY_PATTERN = {
+    1: [CHECKED] * 15 + [UNCHECKED] * 15,
+    2: [UNCHECKED] * 15 + [CHECKED] * 15,
+}
+OFF_DUTY_PATTERN = [UNCHECKED] * 30
+
 
 class ExcelGenerator:
     """Handles generation of Excel output files."""
@@ -18,6 +29,7 @@ class ExcelGenerator:
     def __init__(self):
         """Initialize the ExcelGenerator."""
         self.base_letter_map = {1: "A", 2: "B", 3: "C"}
+        self.letter_to_base = {letter: base_id for base_id, letter in self.base_letter_map.items()}
 
     def generate_output(
         self,
@@ -27,10 +39,14 @@ class ExcelGenerator:
         mechanic_inspector_skills,
         inspector_req_columns,
         base_schedule_df,
+        output=None,
     ):
         """
         Generate Excel output file.
 
+        The workbook is streamed row by row with xlsxwriter in constant_memory
+        mode, so rows are flushed to disk as they are written.
+
         Args:
             assignments: List of assignment dictionaries
             data: Dictionary containing processed data
@@ -38,88 +54,72 @@ class ExcelGenerator:
             mechanic_inspector_skills: Dictionary of mechanic inspector skills
             inspector_req_columns: List of inspector requirement columns
             base_schedule_df: DataFrame with base schedule information
+            output: Optional file path or writable binary file-like object
+                (default: a new in-memory buffer)
 
         Returns:
-            Workbook: OpenPyXL Workbook object
+            The output the workbook was written to; a new io.BytesIO is
+            returned rewound to the start
         """
         logger.info("Generating Excel output")
         bases = data["bases"]
         periods = data["periods"]
         shifts = data["shifts"]
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Roster"
-
-        # Styles
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        section_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-        section_font = Font(bold=True, size=11)
-        center_align = Alignment(horizontal="center", vertical="center")
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
+        if output is None:
+            output = io.BytesIO()
+
+        wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+        ws = wb.add_worksheet("Roster")
+
+        # Styles: one shared format object per style class
+        header_fmt = wb.add_format(
+            {
+                "bold": True,
+                "font_color": "#FFFFFF",
+                "font_size": 11,
+                "bg_color": "#366092",
+                "align": "center",
+                "valign": "vcenter",
+                "border": 1,
+            }
         )
+        section_fmt = wb.add_format(
+            {"bold": True, "font_size": 11, "bg_color": "#D9E1F2", "align": "left", "valign": "vcenter", "border": 1}
+        )
+        border_fmt = wb.add_format({"border": 1})
+        data_fmt = wb.add_format({"align": "center", "valign": "vcenter", "border": 1})
 
         # Headers
         headers = ["Base", "Roster", "Airframe", "Engine", "Avionics", "Position"] + [f"Day {i}" for i in range(1, 31)]
-        ws.append(headers)
-
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_idx)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = center_align
-            cell.border = thin_border
-
-        # Helper functions
-        def get_position(mechanic_id, has_inspector_skill_for_shift, mechanic_skills_dict):
-            # Inspector override: if selected as inspector for this shift, always Inspector
-            if has_inspector_skill_for_shift:
-                return "Inspector"
-
-            has_airframe = False
-            has_engine = False
-            has_avionics = False
-
-            for aircraft in ["aw139", "h175", "sk92"]:
-                if mechanic_skills_dict.get(f"{aircraft}_af", 0) == 1:
-                    has_airframe = True
-                if mechanic_skills_dict.get(f"{aircraft}_r", 0) == 1:
-                    has_engine = True
-                if mechanic_skills_dict.get(f"{aircraft}_av", 0) == 1:
-                    has_avionics = True
-
-            # Position rules:
-            # - If mechanic has avionics skill and any of airframe/engine missing → Avionic
-            # - If mechanic has airframe and/or engine and no avionics → Mechanic
-            # - If mechanic has all three skills → Mechanic
-            if has_avionics and not (has_airframe and has_engine):
-                return "Avionic"
-            if has_airframe or has_engine or has_avionics:
-                return "Mechanic"
-            # If no skills flagged, default to Mechanic
-            return "Mechanic"
-
-        def has_skill_type(mechanic_id, skill_type, mechanic_skills_dict):
-            for aircraft in ["aw139", "h175", "sk92"]:
-                if mechanic_skills_dict.get(f"{aircraft}{skill_type}", 0) == 1:
-                    return True
-            return False
-
-        # Organize assignments
-        assignments_by_base_shift = {}
-        for assignment in assignments:
+        ws.set_column(0, 5, 12)
+        ws.set_column(6, len(headers) - 1, 8)
+        ws.write_row(0, 0, headers, header_fmt)
+
+        # Skill-type flags and default position for every mechanic, classified as arrays.
+        # Position rules:
+        # - If mechanic has avionics skill and any of airframe/engine missing → Avionic
+        # - If mechanic has airframe and/or engine and no avionics → Mechanic
+        # - If mechanic has all three skills (or none flagged) → Mechanic
+        # Being selected as inspector for the shift overrides this with "Inspector".
+        aircraft_types = ["aw139", "h175", "sk92"]
+        skill_type_cols = [f"{aircraft}{skill}" for skill in ("_af", "_r", "_av") for aircraft in aircraft_types]
+        skills_frame = pd.DataFrame.from_dict(mechanic_skills, orient="index").reindex(columns=skill_type_cols, fill_value=0)
+        skill_flags = (skills_frame.fillna(0).to_numpy() == 1).reshape(len(skills_frame), 3, len(aircraft_types)).any(axis=2)
+        has_airframe, has_engine, has_avionics = skill_flags.T
+        default_positions = np.where(has_avionics & ~(has_airframe & has_engine), "Avionic", "Mechanic")
+
+        # Airframe/Engine/Avionics checkbox cells are rendered once per mechanic, not per row
+        skill_cells = dict(zip(skills_frame.index.tolist(), np.where(skill_flags, CHECKED, UNCHECKED).tolist()))
+        mechanic_positions = dict(zip(skills_frame.index.tolist(), default_positions.tolist()))
+        no_skill_cells = [UNCHECKED] * 3
+
+        # Organize assignments; sorting once up front leaves every bucket ordered by mechanic
+        assignments_by_base_shift = defaultdict(list)
+        for assignment in sorted(assignments, key=lambda a: a["mechanic_id"]):
             base_id = assignment["base_id"]
             shift = assignment["shift"]
-            key = (self.base_letter_map.get(base_id, base_id), shift)
-
-            if key not in assignments_by_base_shift:
-                assignments_by_base_shift[key] = []
-            assignments_by_base_shift[key].append(
+            assignments_by_base_shift[(self.base_letter_map.get(base_id, base_id), shift)].append(
                 {
                     "mechanic_id": assignment["mechanic_id"],
                     "group": assignment["group"],
@@ -127,94 +127,67 @@ class ExcelGenerator:
                 }
             )
 
-        sorted_keys = sorted(assignments_by_base_shift.keys(), key=lambda x: (x[0], x[1]))
-        current_row = 2
+        # Inspector requirements per (base, shift), across all periods
+        inspector_reqs = {}
+        if inspector_req_columns:
+            req_columns = [col for col in inspector_req_columns if col in base_schedule_df.columns]
+            for row in base_schedule_df[["base_id", "shift"] + req_columns].itertuples(index=False, name=None):
+                required = inspector_reqs.setdefault((int(row[0]), int(row[1])), set())
+                required.update(col for col, value in zip(req_columns, row[2:]) if pd.notna(value) and value > 0)
+
+        # A mechanic acts as inspector when they hold an inspector skill required on their
+        # base/shift and another mechanic in the same base/shift holds the matching regular skill
+        inspectors = set()
+        for (base_letter, shift_num), base_assignments in assignments_by_base_shift.items():
+            base_id = self.letter_to_base.get(base_letter, base_letter)
+            for inspector_col in inspector_reqs.get((base_id, shift_num), ()):
+                regular_skill_name = inspector_col.replace("_inspec", "")
+                regular_holders = {
+                    a["mechanic_id"]
+                    for a in base_assignments
+                    if mechanic_skills.get(a["mechanic_id"], {}).get(regular_skill_name, 0) == 1
+                }
+                for a in base_assignments:
+                    mechanic_id = a["mechanic_id"]
+                    has_inspector_skill = mechanic_inspector_skills.get(mechanic_id, {}).get(inspector_col, 0) == 1
+                    if has_inspector_skill and regular_holders - {mechanic_id}:
+                        inspectors.add((base_letter, shift_num, mechanic_id))
+
+        current_row = 1
 
-        for base_letter, shift_num in sorted_keys:
+        for base_letter, shift_num in sorted(assignments_by_base_shift):
             shift_name = "Day Shift" if shift_num == 1 else "Night Shift"
 
             # Section header
-            ws.append([shift_name] + [None] * (len(headers) - 1))
-            section_row = current_row
-            cell = ws.cell(row=section_row, column=1)
-            cell.fill = section_fill
-            cell.font = section_font
-            cell.alignment = Alignment(horizontal="left", vertical="center")
-            cell.border = thin_border
-            for col_idx in range(2, len(headers) + 1):
-                cell = ws.cell(row=section_row, column=col_idx)
-                cell.border = thin_border
+            ws.write(current_row, 0, shift_name, section_fmt)
+            ws.write_row(current_row, 1, [None] * (len(headers) - 1), border_fmt)
             current_row += 1
 
             base_assignments = assignments_by_base_shift[(base_letter, shift_num)]
-            base_assignments.sort(key=lambda x: x["mechanic_id"])
 
             for assignment_info in base_assignments:
                 mechanic_id = assignment_info["mechanic_id"]
                 group = assignment_info["group"]
-                m_skills = mechanic_skills.get(mechanic_id, {})
-
-                # Determine if this mechanic is acting as inspector
-                is_inspector = False
-                if inspector_req_columns:
-                    for _, row in base_schedule_df.iterrows():
-                        if (
-                            int(row["base_id"]) == [k for k, v in self.base_letter_map.items() if v == base_letter][0]
-                            and int(row["shift"]) == shift_num
-                        ):
-                            for inspector_col in inspector_req_columns:
-                                if inspector_col in base_schedule_df.columns:
-                                    inspector_required = row[inspector_col]
-                                    if pd.notna(inspector_required) and inspector_required > 0:
-                                        if mechanic_inspector_skills.get(mechanic_id, {}).get(inspector_col, 0) == 1:
-                                            regular_skill_name = inspector_col.replace("_inspec", "")
-                                            other_mechanics = [
-                                                a["mechanic_id"]
-                                                for a in base_assignments
-                                                if a["mechanic_id"] != mechanic_id
-                                                and mechanic_skills.get(a["mechanic_id"], {}).get(regular_skill_name, 0) == 1
-                                            ]
-                                            if other_mechanics:
-                                                is_inspector = True
-                                                break
-                            if is_inspector:
-                                break
-
-                position = get_position(mechanic_id, is_inspector, m_skills)
-                has_airframe = has_skill_type(mechanic_id, "_af", m_skills)
-                has_engine = has_skill_type(mechanic_id, "_r", m_skills)
-                has_avionics = has_skill_type(mechanic_id, "_av", m_skills)
 
-                # Row data with checkbox-style symbols
-                row_data = [
-                    base_letter,
-                    f"Mechanic {mechanic_id}",
-                    "☑" if has_airframe else "☐",
-                    "☑" if has_engine else "☐",
-                    "☑" if has_avionics else "☐",
-                    position,
-                ]
-
-                for day in range(1, 31):
-                    if (day <= 15 and group == 1) or (day > 15 and group == 2):
-                        row_data.append("☑")
-                    else:
-                        row_data.append("☐")
-
-                ws.append(row_data)
-
-                for col_idx in range(1, len(headers) + 1):
-                    cell = ws.cell(row=current_row, column=col_idx)
-                    cell.alignment = center_align
-                    cell.border = thin_border
+                if (base_letter, shift_num, mechanic_id) in inspectors:
+                    position = "Inspector"
+                else:
+                    position = mechanic_positions.get(mechanic_id, "Mechanic")
 
+                # Row data with checkbox-style symbols
+                row_data = (
+                    [base_letter, f"Mechanic {mechanic_id}"]
+                    + skill_cells.get(mechanic_id, no_skill_cells)
+                    + [position]
+                    + DAY_PATTERN.get(group, OFF_DUTY_PATTERN)
+                )
+
+                ws.write_row(current_row, 0, row_data, data_fmt)
                 current_row += 1
 
-        for col_idx, header in enumerate(headers, 1):
-            if col_idx <= 6:
-                ws.column_dimensions[get_column_letter(col_idx)].width = 12
-            else:
-                ws.column_dimensions[get_column_letter(col_idx)].width = 8
+        wb.close()
+        if isinstance(output, io.BytesIO):
+            output.seek(0)
 
         logger.info("Excel output generated successfully")
-        return wb
+        return output
@@ -3,30 +3,68 @@ Optimization model creation and solving module.
 """
 
 import logging
+import math
+import time
 
-import pandas as pd
-from ortools.linear_solver import pywraplp
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2, pywraplp
 
 logger = logging.getLogger(__name__)
 
 
+def _add_constraint(model, lb, ub, name, var_indices, coefficients=None):
+    """
+    Append a constraint lb <= sum(coefficient * variable) <= ub to a model proto.
+
+    Terms are written straight into the proto's repeated fields, so no SWIG
+    call is made per coefficient; the whole model reaches the solver in one
+    LoadModelFromProto call.
+
+    Args:
+        model: linear_solver_pb2.MPModelProto being built
+        lb: Lower bound
+        ub: Upper bound
+        name: Constraint name
+        var_indices: List of variable indices
+        coefficients: Optional list of coefficients (default: all 1)
+
+    Returns:
+        MPConstraintProto: The created constraint
+    """
+    constraint = model.constraint.add(lower_bound=lb, upper_bound=ub, name=name)
+    constraint.var_index.extend(var_indices)
+    constraint.coefficient.extend([1.0] * len(var_indices) if coefficients is None else coefficients)
+    return constraint
+
+
 class RosterOptimizer:
     """Handles optimization model creation and solving."""
 
-    def __init__(self, solver_name="SCIP"):
+    # Parallel search workers used when the CP-SAT backend is selected
+    CP_SAT_NUM_WORKERS = 8
+    # Backends that crash on MPSolver.SetHint (HiGHS as of OR-Tools 9.15)
+    NO_HINT_SOLVERS = ("HIGHS",)
+
+    def __init__(self, solver_name="SCIP", debug_names=False):
         """
         Initialize the optimizer.
 
         Args:
             solver_name: Name of the solver to use (default: "SCIP")
+            debug_names: Give variables and constraints descriptive names (default: False,
+                leaving them unnamed to keep model building lean)
         """
         self.solver_name = solver_name
+        self.debug_names = debug_names
         self.solver = None
         self.x = None
+        self._x_index = None
+        self._x_axes = None
         self.mechanic_skills = None
         self.mechanic_inspector_skills = None
         self.inspector_req_columns = None
         self.avoidance_vars = None
+        self._avoidance_penalties = None
 
     def create_model(self, data):
         """
@@ -46,8 +84,18 @@ class RosterOptimizer:
         bases = data["bases"]
         periods = data["periods"]
         shifts = data["shifts"]
-        cost_dict = data["cost_dict"]
+        # DataLoader provides the dense cost matrix; build it from cost_dict for hand-built data dicts
+        cost_array = data.get("cost_array")
+        if cost_array is None:
+            cost_dict = data["cost_dict"]
+            cost_array = np.array([[cost_dict.get((m, b), 0) for b in bases] for m in mechanics], dtype=np.float64).reshape(
+                len(mechanics), len(bases)
+            )
         avoidance_dict = data["avoidance_dict"]
+        # DataLoader provides the unique pairs; derive them once for hand-built data dicts
+        avoidance_pairs = data.get("avoidance_pairs")
+        if avoidance_pairs is None:
+            avoidance_pairs = sorted({(min(m1, m2), max(m1, m2)) for m1, m2 in avoidance_dict})
 
         # Create solver
         logger.info(f"Creating solver: {self.solver_name}")
@@ -56,198 +104,282 @@ class RosterOptimizer:
             logger.warning(f"{self.solver_name} not available, falling back to CBC")
             solver = pywraplp.Solver.CreateSolver("CBC")
             self.solver_name = "CBC"
+        if self.solver_name == "CP_SAT":
+            # The model is pure 0/1; CP-SAT's portfolio search needs several workers to shine
+            solver.SetNumThreads(self.CP_SAT_NUM_WORKERS)
 
-        # Create decision variables: x[m, b, g, s]
+        # Mechanic skill lookups
+        aircraft_types = ["aw139", "h175", "sk92"]
+        skill_types = ["_af", "_r", "_av"]
+
+        skill_cols = [f"{aircraft}{skill}" for aircraft in aircraft_types for skill in skill_types]
+        present_skill_cols = [col for col in skill_cols if col in mechanic_skills_df.columns]
+        present_inspector_cols = [f"{col}_inspec" for col in skill_cols if f"{col}_inspec" in mechanic_skills_df.columns]
+
+        # One row per mechanic (the last row wins for repeated ids), ordered like `mechanics`
+        skills_by_mechanic = (
+            mechanic_skills_df.drop_duplicates("mechanic_id", keep="last").set_index("mechanic_id").reindex(mechanics)
+        )
+        mechanic_skills = skills_by_mechanic[present_skill_cols].astype(np.int8).to_dict(orient="index")
+        mechanic_inspector_skills = skills_by_mechanic[present_inspector_cols].astype(np.int8).to_dict(orient="index")
+
+        # Dense mechanics x skill boolean matrices, inverted into skill column -> positions
+        # of the mechanics holding it
+        skills_mat = skills_by_mechanic[present_skill_cols].to_numpy() == 1
+        inspector_mat = skills_by_mechanic[present_inspector_cols].to_numpy() == 1
+        no_mechanics = np.empty(0, dtype=np.intp)
+        skill_holders = {col: np.flatnonzero(skills_mat[:, k]) for k, col in enumerate(present_skill_cols)}
+        inspector_holders = {col: np.flatnonzero(inspector_mat[:, k]) for k, col in enumerate(present_inspector_cols)}
+
+        # Rows repeating a (base, period, shift) would only add duplicate constraints; keep one
+        # row per cell requiring the maximum of each requirement
+        present_aircraft = [aircraft for aircraft in aircraft_types if aircraft in base_schedule_df.columns]
+        inspector_req_columns = [col for col in base_schedule_df.columns if col.endswith("_inspec")]
+        schedule = base_schedule_df.groupby(["base_id", "period", "shift"], as_index=False, sort=False)[
+            present_aircraft + inspector_req_columns
+        ].max()
+
+        # Schedule columns pulled out once as arrays; requirements become boolean masks (a missing
+        # inspector requirement is NaN, which never compares > 0), reduced to the aircraft and
+        # inspector columns each cell needs. A single pass over the cells drives constraints 2-4
+        base_pos = {b: j for j, b in enumerate(bases)}
+        period_pos = {g: k for k, g in enumerate(periods)}
+        shift_pos = {s: n for n, s in enumerate(shifts)}
+        aircraft_mask = schedule[present_aircraft].to_numpy(dtype=np.float64) > 0
+        inspector_mask = schedule[inspector_req_columns].to_numpy(dtype=np.float64) > 0
+        schedule_cells = [
+            (
+                base_id,
+                period,
+                shift,
+                (base_pos[base_id], period_pos[period], shift_pos[shift]),
+                [present_aircraft[a] for a in np.flatnonzero(aircraft_row)],
+                [inspector_req_columns[c] for c in np.flatnonzero(inspector_row)],
+            )
+            for (base_id, period, shift), aircraft_row, inspector_row in zip(
+                schedule[["base_id", "period", "shift"]].to_numpy(dtype=np.int64).tolist(), aircraft_mask, inspector_mask
+            )
+        ]
+
+        # Holders of the regular skill behind each inspector requirement column
+        regular_holders = {col: skill_holders.get(col.replace("_inspec", ""), no_mechanics) for col in inspector_req_columns}
+
+        # No self-inspection: an inspector on shift needs another regular-skill holder alongside.
+        # When every inspector of a column holds the regular skill and there are at least two
+        # holders, constraint 3 already puts an inspector in each cell requiring the column, so
+        # the per-inspector rows x_i <= sum(other holders) collapse exactly into one
+        # count row per cell, sum(holders) >= 2 (with a tighter LP relaxation).
+        # Otherwise each inspector keeps its own row (holder positions with -1 coefficients).
+        paired_holders = {}
+        self_inspection_terms = {}
+        for col in inspector_req_columns:
+            holders = regular_holders[col]
+            inspectors = inspector_holders.get(col, no_mechanics)
+            if holders.size >= 2 and np.isin(inspectors, holders).all():
+                paired_holders[col] = holders
+                self_inspection_terms[col] = []
+                continue
+            terms = self_inspection_terms[col] = []
+            for i_inspector in inspectors.tolist():
+                others = holders[holders != i_inspector]
+                if others.size:
+                    terms.append((i_inspector, others, [1.0] + [-1.0] * others.size))
+
+        # Mechanics that can contribute to some requirement of each (base, period, shift) cell,
+        # as a mechanics x bases x periods x shifts mask
+        shape = (len(mechanics), len(bases), len(periods), len(shifts))
+        useful = np.zeros(shape, dtype=bool)
+        for _, _, _, (j, k, n), required_aircraft, required_inspectors in schedule_cells:
+            for aircraft in required_aircraft:
+                for skill in skill_types:
+                    useful[skill_holders.get(f"{aircraft}{skill}", no_mechanics), j, k, n] = True
+            for inspector_col in required_inspectors:
+                useful[inspector_holders.get(inspector_col, no_mechanics), j, k, n] = True
+                useful[regular_holders[inspector_col], j, k, n] = True
+        # A negative movement cost makes the assignment worth taking on its own
+        useful |= (cost_array < 0)[:, :, None, None]
+        # A negative avoidance penalty rewards the pair for working together, in any cell
+        mechanic_pos = {m: i for i, m in enumerate(mechanics)}
+        for m1, m2 in avoidance_pairs:
+            if avoidance_dict[(m1, m2)] < 0:
+                useful[[mechanic_pos[m1], mechanic_pos[m2]]] = True
+
+        # Decision variables x[m, b, g, s], numbered in mechanics x bases x periods x shifts order.
+        # Other cells get no variable (index -1): with a non-negative movement cost and no
+        # avoidance reward such an assignment can only add cost.
+        # The model is assembled as an MPModelProto and handed to the solver in a single call
         logger.info("Creating decision variables")
-        x = {}
-        for m in mechanics:
-            for b in bases:
-                for g in periods:
-                    for s in shifts:
-                        var_name = f"x_m{m}_b{b}_g{g}_s{s}"
-                        x[(m, b, g, s)] = solver.IntVar(0, 1, var_name)
+        names = self.debug_names
+        model = linear_solver_pb2.MPModelProto()
+        add_variable = model.variable.add
+        var_cells = np.argwhere(useful)
+        num_x = len(var_cells)
+        var_index = np.full(shape, -1, dtype=np.int64)
+        var_index[useful] = np.arange(num_x)
+        var_costs = cost_array[var_cells[:, 0], var_cells[:, 1]]
+        for (i, j, k, n), cost in zip(var_cells.tolist(), var_costs.tolist()):
+            add_variable(
+                lower_bound=0,
+                upper_bound=1,
+                is_integer=True,
+                objective_coefficient=cost,
+                name=f"x_m{mechanics[i]}_b{bases[j]}_g{periods[k]}_s{shifts[n]}" if names else "",
+            )
 
         # Constraint 1: Each mechanic ≤ 1 assignment
         logger.info("Adding single assignment constraints")
-        for m in mechanics:
-            constraint = solver.Constraint(0, 1, f"mechanic_{m}_single_assignment")
-            for b in bases:
-                for g in periods:
-                    for s in shifts:
-                        constraint.SetCoefficient(x[(m, b, g, s)], 1)
-
-        # Constraint 2: Skill coverage
+        for i, m in enumerate(mechanics):
+            mechanic_vars = var_index[i][useful[i]].tolist()
+            if mechanic_vars:
+                _add_constraint(model, 0, 1, f"mechanic_{m}_single_assignment" if names else "", mechanic_vars)
+
         logger.info("Adding skill coverage constraints")
-        aircraft_types = ["aw139", "h175", "sk92"]
-        skill_types = ["_af", "_r", "_av"]
+        if inspector_req_columns:
+            logger.info("Adding inspector coverage and no self-inspection constraints")
 
-        mechanic_skills = {}
-        mechanic_inspector_skills = {}
-        for _, row in mechanic_skills_df.iterrows():
-            m = int(row["mechanic_id"])
-            mechanic_skills[m] = {}
-            mechanic_inspector_skills[m] = {}
-            for aircraft in aircraft_types:
-                for skill in skill_types:
-                    col_name = f"{aircraft}{skill}"
-                    if col_name in mechanic_skills_df.columns:
-                        mechanic_skills[m][col_name] = int(row[col_name])
-                    inspector_col_name = f"{aircraft}{skill}_inspec"
-                    if inspector_col_name in mechanic_skills_df.columns:
-                        mechanic_inspector_skills[m][inspector_col_name] = int(row[inspector_col_name])
-
-        for _, row in base_schedule_df.iterrows():
-            base_id = int(row["base_id"])
-            period = int(row["period"])
-            shift = int(row["shift"])
-
-            for aircraft in aircraft_types:
-                if aircraft in base_schedule_df.columns and row[aircraft] > 0:
-                    for skill in skill_types:
-                        skill_name = f"{aircraft}{skill}"
-                        constraint = solver.Constraint(
-                            1, solver.infinity(), f"skill_{skill_name}_base{base_id}_period{period}_shift{shift}"
-                        )
-                        for m in mechanics:
-                            if mechanic_skills[m].get(skill_name, 0) == 1:
-                                constraint.SetCoefficient(x[(m, base_id, period, shift)], 1)
+        for base_id, period, shift, (j, k, n), required_aircraft, required_inspectors in schedule_cells:
+            cell_vars = var_index[:, j, k, n]
 
-        # Constraint 3: Inspector coverage
-        inspector_req_columns = [col for col in base_schedule_df.columns if col.endswith("_inspec")]
-        if inspector_req_columns:
-            logger.info("Adding inspector coverage constraints")
-            for _, row in base_schedule_df.iterrows():
-                base_id = int(row["base_id"])
-                period = int(row["period"])
-                shift = int(row["shift"])
-
-                for inspector_col in inspector_req_columns:
-                    if inspector_col in base_schedule_df.columns:
-                        inspector_required = row[inspector_col]
-                        if pd.notna(inspector_required) and inspector_required > 0:
-                            constraint = solver.Constraint(
-                                1,
-                                solver.infinity(),
-                                f"inspector_{inspector_col}_base{base_id}_period{period}_shift{shift}",
-                            )
-                            for m in mechanics:
-                                if mechanic_inspector_skills[m].get(inspector_col, 0) == 1:
-                                    constraint.SetCoefficient(x[(m, base_id, period, shift)], 1)
-
-        # Constraint 4: No self-inspection
-        if inspector_req_columns:
-            logger.info("Adding no self-inspection constraints")
-            for _, row in base_schedule_df.iterrows():
-                base_id = int(row["base_id"])
-                period = int(row["period"])
-                shift = int(row["shift"])
-
-                for inspector_col in inspector_req_columns:
-                    if inspector_col in base_schedule_df.columns:
-                        inspector_required = row[inspector_col]
-                        if pd.notna(inspector_required) and inspector_required > 0:
-                            regular_skill_name = inspector_col.replace("_inspec", "")
-
-                            for m_inspector in mechanics:
-                                if mechanic_inspector_skills[m_inspector].get(inspector_col, 0) == 1:
-                                    other_mechanics_with_skill = [
-                                        m
-                                        for m in mechanics
-                                        if m != m_inspector and mechanic_skills[m].get(regular_skill_name, 0) == 1
-                                    ]
-
-                                    if other_mechanics_with_skill:
-                                        constraint = solver.Constraint(
-                                            -solver.infinity(),
-                                            0,
-                                            f"no_self_inspect_{inspector_col}"
-                                            f"_base{base_id}_period{period}_shift{shift}_inspector{m_inspector}",
-                                        )
-                                        constraint.SetCoefficient(x[(m_inspector, base_id, period, shift)], 1)
-                                        for m_other in other_mechanics_with_skill:
-                                            constraint.SetCoefficient(x[(m_other, base_id, period, shift)], -1)
-
-        # Avoidance penalty variables
-        avoidance_vars = {}
-        if avoidance_dict:
+            # Constraint 2: Skill coverage
+            for aircraft in required_aircraft:
+                for skill in skill_types:
+                    skill_name = f"{aircraft}{skill}"
+                    _add_constraint(
+                        model,
+                        1,
+                        math.inf,
+                        f"skill_{skill_name}_base{base_id}_period{period}_shift{shift}" if names else "",
+                        cell_vars[skill_holders.get(skill_name, no_mechanics)].tolist(),
+                    )
+
+            for inspector_col in required_inspectors:
+                # Constraint 3: Inspector coverage
+                inspectors = inspector_holders.get(inspector_col, no_mechanics)
+                _add_constraint(
+                    model,
+                    1,
+                    math.inf,
+                    f"inspector_{inspector_col}_base{base_id}_period{period}_shift{shift}" if names else "",
+                    cell_vars[inspectors].tolist(),
+                )
+
+                # Constraint 4: No self-inspection
+                if inspector_col in paired_holders:
+                    _add_constraint(
+                        model,
+                        2,
+                        math.inf,
+                        f"no_self_inspect_{inspector_col}_base{base_id}_period{period}_shift{shift}" if names else "",
+                        cell_vars[paired_holders[inspector_col]].tolist(),
+                    )
+                for i_inspector, others, coefficients in self_inspection_terms[inspector_col]:
+                    _add_constraint(
+                        model,
+                        -math.inf,
+                        0,
+                        (
+                            f"no_self_inspect_{inspector_col}"
+                            f"_base{base_id}_period{period}_shift{shift}_inspector{mechanics[i_inspector]}"
+                            if names
+                            else ""
+                        ),
+                        [int(cell_vars[i_inspector])] + cell_vars[others].tolist(),
+                        coefficients,
+                    )
+
+        # Avoidance penalty variables, numbered after the x variables
+        avoidance_index = {}
+        if avoidance_pairs:
             logger.info("Adding avoidance constraints")
-            unique_pairs = set()
-            for m1, m2 in avoidance_dict.keys():
-                if m1 < m2:
-                    unique_pairs.add((m1, m2))
-
-            for m1, m2 in unique_pairs:
-                for b in bases:
-                    for g in periods:
-                        for s in shifts:
-                            var_name = f"y_avoid_m{m1}_m{m2}_b{b}_g{g}_s{s}"
-                            avoidance_vars[(m1, m2, b, g, s)] = solver.IntVar(0, 1, var_name)
-
-            # Linearization constraints
-            for m1, m2 in unique_pairs:
-                for b in bases:
-                    for g in periods:
-                        for s in shifts:
-                            y_var = avoidance_vars[(m1, m2, b, g, s)]
-
-                            c1 = solver.Constraint(-solver.infinity(), 0, f"avoid_y_le_x1_m{m1}_m{m2}_b{b}_g{g}_s{s}")
-                            c1.SetCoefficient(y_var, 1)
-                            c1.SetCoefficient(x[(m1, b, g, s)], -1)
-
-                            c2 = solver.Constraint(-solver.infinity(), 0, f"avoid_y_le_x2_m{m1}_m{m2}_b{b}_g{g}_s{s}")
-                            c2.SetCoefficient(y_var, 1)
-                            c2.SetCoefficient(x[(m2, b, g, s)], -1)
-
-                            c3 = solver.Constraint(-1, solver.infinity(), f"avoid_y_ge_sum_m{m1}_m{m2}_b{b}_g{g}_s{s}")
-                            c3.SetCoefficient(y_var, -1)
-                            c3.SetCoefficient(x[(m1, b, g, s)], 1)
-                            c3.SetCoefficient(x[(m2, b, g, s)], 1)
-
-        # Objective function
-        logger.info("Setting up objective function")
-        objective = solver.Objective()
-
-        # Movement costs
-        for m in mechanics:
-            for b in bases:
-                cost = cost_dict.get((m, b), 0)
-                for g in periods:
-                    for s in shifts:
-                        objective.SetCoefficient(x[(m, b, g, s)], cost)
-
-        # Avoidance penalties
-        if avoidance_dict and avoidance_vars:
-            unique_pairs = set()
-            for m1, m2 in avoidance_dict.keys():
-                if m1 < m2:
-                    unique_pairs.add((m1, m2))
-
-            for m1, m2 in unique_pairs:
+            # Constraint 1 puts each mechanic in at most one cell, so a pair shares at most one
+            # cell and a single y per pair is enough: y >= x1 + x2 - 1 in every cell both can use.
+            # A positive penalty already drives y to 0 otherwise, so no upper bound is needed.
+            # A negative penalty rewards y instead, which is then bounded by the pair actually
+            # sharing a cell: y <= sum(x1) and, in every cell, y <= 1 - x1 + x2.
+            # Pairs with a zero penalty, or with no cell both can use, are left out of the model.
+            for m1, m2 in avoidance_pairs:
                 penalty = avoidance_dict[(m1, m2)]
-                for b in bases:
-                    for g in periods:
-                        for s in shifts:
-                            if (m1, m2, b, g, s) in avoidance_vars:
-                                objective.SetCoefficient(avoidance_vars[(m1, m2, b, g, s)], penalty)
-
-        objective.SetMinimization()
+                if penalty == 0:
+                    continue
+                i1, i2 = mechanic_pos[m1], mechanic_pos[m2]
+                shared_cells = np.argwhere(useful[i1] & useful[i2]).tolist()
+                if not shared_cells:
+                    continue
+                y_idx = len(model.variable)
+                add_variable(
+                    lower_bound=0,
+                    upper_bound=1,
+                    is_integer=True,
+                    objective_coefficient=penalty,
+                    name=f"y_avoid_m{m1}_m{m2}" if names else "",
+                )
+                avoidance_index[(m1, m2)] = y_idx
+                if penalty > 0:
+                    for j, k, n in shared_cells:
+                        _add_constraint(
+                            model,
+                            -math.inf,
+                            1,
+                            f"avoid_m{m1}_m{m2}_b{bases[j]}_g{periods[k]}_s{shifts[n]}" if names else "",
+                            [int(var_index[i1, j, k, n]), int(var_index[i2, j, k, n]), y_idx],
+                            [1.0, 1.0, -1.0],
+                        )
+                    continue
+                # Both mechanics have a variable in every cell here, so shared_cells covers all of m1's
+                m1_vars = [int(var_index[i1, j, k, n]) for j, k, n in shared_cells]
+                _add_constraint(
+                    model,
+                    -math.inf,
+                    0,
+                    f"avoid_m{m1}_m{m2}_assigned" if names else "",
+                    [y_idx] + m1_vars,
+                    [1.0] + [-1.0] * len(m1_vars),
+                )
+                for (j, k, n), m1_var in zip(shared_cells, m1_vars):
+                    _add_constraint(
+                        model,
+                        -math.inf,
+                        1,
+                        f"avoid_m{m1}_m{m2}_b{bases[j]}_g{periods[k]}_s{shifts[n]}" if names else "",
+                        [y_idx, m1_var, int(var_index[i2, j, k, n])],
+                        [1.0, 1.0, -1.0],
+                    )
+
+        # Objective: movement costs and avoidance penalties are already set on the variables
+        logger.info("Loading model into solver")
+        model.maximize = False
+        error = solver.LoadModelFromProtoKeepNames(model)
+        if error:
+            raise RuntimeError(f"Could not load model into {self.solver_name}: {error}")
+
+        # Variable handles for callers, in the same order as the proto
+        variables = solver.variables()
+        x = {(mechanics[i], bases[j], periods[k], shifts[n]): var for (i, j, k, n), var in zip(var_cells.tolist(), variables)}
+        avoidance_vars = {pair: variables[y_idx] for pair, y_idx in avoidance_index.items()}
 
         self.solver = solver
         self.x = x
+        self._x_index = var_cells
+        self._x_axes = (mechanics, bases, periods, shifts)
         self.mechanic_skills = mechanic_skills
         self.mechanic_inspector_skills = mechanic_inspector_skills
         self.inspector_req_columns = inspector_req_columns
         self.avoidance_vars = avoidance_vars
+        self._avoidance_penalties = {pair: avoidance_dict[pair] for pair in avoidance_index}
 
         logger.info(f"Model created: {solver.NumVariables()} variables, {solver.NumConstraints()} constraints")
         return solver, x, mechanic_skills, mechanic_inspector_skills, inspector_req_columns, avoidance_vars
 
-    def solve(self, time_limit_seconds=None):
+    def solve(self, time_limit_seconds=None, num_threads=None, relative_gap=None, warm_start=None):
         """
         Solve the optimization model.
 
         Args:
             time_limit_seconds: Optional time limit for solving (in seconds)
+            num_threads: Optional number of solver threads
+            relative_gap: Optional relative MIP gap at which to stop (e.g. 0.01 for 1%)
+            warm_start: Optional assignments list from a previous extract_solution, passed to
+                the solver as a hint (used by SCIP and CP-SAT; CBC ignores it, HiGHS skips it)
 
         Returns:
             tuple: (status, solve_time)
@@ -256,18 +388,46 @@ class RosterOptimizer:
             raise ValueError("Model must be created before solving")
 
         if time_limit_seconds:
-            self.solver.SetTimeLimit(time_limit_seconds * 1000)  # Convert to milliseconds
+            self.solver.SetTimeLimit(int(time_limit_seconds * 1000))  # Convert to milliseconds
 
-        logger.info("Solving optimization problem")
-        import time
+        if num_threads:
+            if not self.solver.SetNumThreads(num_threads):
+                logger.warning(f"{self.solver_name} does not support setting the number of threads")
+
+        params = pywraplp.MPSolverParameters()
+        if relative_gap is not None:
+            params.SetDoubleParam(pywraplp.MPSolverParameters.RELATIVE_MIP_GAP, relative_gap)
 
+        if warm_start is not None and self.solver_name in self.NO_HINT_SOLVERS:
+            logger.warning(f"{self.solver_name} does not support warm start hints, solving from scratch")
+        elif warm_start is not None:
+            # Hint every assignment variable: 1 for the previous assignments, 0 elsewhere.
+            # Assignments to cells without a variable in this model are dropped
+            hinted = {(a["mechanic_id"], a["base_id"], a["group"], a["shift"]) for a in warm_start}
+            self.solver.SetHint(list(self.x.values()), [1.0 if key in hinted else 0.0 for key in self.x])
+            logger.info(f"Warm start hint: {len(hinted & self.x.keys())} of {len(hinted)} assignments")
+
+        logger.info("Solving optimization problem")
         start_time = time.time()
-        status = self.solver.Solve()
+        status = self.solver.Solve(params)
         solve_time = time.time() - start_time
 
         logger.info(f"Solve completed: status={status}, time={solve_time:.2f}s")
         return status, solve_time
 
+    def _solution_values(self):
+        """
+        Fetch the value of every model variable in a single call to the solver.
+
+        Returns:
+            np.ndarray: Solution values indexed by variable index (zeros without a solution)
+        """
+        response = linear_solver_pb2.MPSolutionResponse()
+        self.solver.FillSolutionResponseProto(response)
+        if len(response.variable_value) != self.solver.NumVariables():
+            return np.zeros(self.solver.NumVariables(), dtype=np.float64)
+        return np.asarray(response.variable_value, dtype=np.float64)
+
     def extract_solution(self, mechanics, bases, periods, shifts, cost_dict):
         """
         Extract solution from the solved model.
@@ -285,26 +445,57 @@ class RosterOptimizer:
         if self.x is None:
             raise ValueError("Model must be created before extracting solution")
 
+        # Read every solution value in one sweep and only visit the chosen cells; the x
+        # variables come first in the model, in _x_index order
+        values = self._solution_values()[: len(self._x_index)]
+        mechanic_set, base_set, period_set, shift_set = set(mechanics), set(bases), set(periods), set(shifts)
+        model_mechanics, model_bases, model_periods, model_shifts = self._x_axes
+
         assignments = []
         total_cost = 0
 
-        for m in mechanics:
-            for b in bases:
-                for g in periods:
-                    for s in shifts:
-                        if self.x[(m, b, g, s)].solution_value() > 0.5:
-                            cost = cost_dict.get((m, b), 0)
-                            total_cost += cost
-                            assignments.append(
-                                {
-                                    "mechanic_id": m,
-                                    "base_id": b,
-                                    "group": g,
-                                    "shift": s,
-                                    "shift_name": "Day" if s == 1 else "Night",
-                                    "cost": cost,
-                                }
-                            )
+        for i, j, k, n in self._x_index[values > 0.5].tolist():
+            m, b, g, s = model_mechanics[i], model_bases[j], model_periods[k], model_shifts[n]
+            if m not in mechanic_set or b not in base_set or g not in period_set or s not in shift_set:
+                continue
+            cost = cost_dict.get((m, b), 0)
+            total_cost += cost
+            assignments.append(
+                {
+                    "mechanic_id": m,
+                    "base_id": b,
+                    "group": g,
+                    "shift": s,
+                    "shift_name": "Day" if s == 1 else "Night",
+                    "cost": cost,
+                }
+            )
 
         logger.info(f"Extracted solution: {len(assignments)} assignments, total cost: {total_cost:.2f}")
         return assignments, total_cost
+
+    def extract_avoidance_penalty(self, assignments):
+        """
+        Extract the total penalty of avoidance pairs working the same base, period and shift.
+
+        The total is computed from the assignments rather than the avoidance variables: a
+        solution returned under a time limit or MIP gap may leave y at 1 for a pair that does
+        not actually share a cell.
+
+        Args:
+            assignments: Assignments list from extract_solution
+
+        Returns:
+            float: Total avoidance penalty of the solution
+        """
+        if self.avoidance_vars is None:
+            raise ValueError("Model must be created before extracting solution")
+
+        cell_of = {a["mechanic_id"]: (a["base_id"], a["group"], a["shift"]) for a in assignments}
+        return float(
+            sum(
+                penalty
+                for (m1, m2), penalty in self._avoidance_penalties.items()
+                if m1 in cell_of and cell_of[m1] == cell_of.get(m2)
+            )
+        )
@@ -31,6 +31,20 @@ def test_config_solver_validation(monkeypatch):
     assert config.solver == "SCIP"
 
 
+def test_config_cp_sat_solver(monkeypatch):
+    """Test CP-SAT is accepted as a solver backend."""
+    monkeypatch.setenv("SOLVER", "CP_SAT")
+    config = Config()
+    assert config.solver == "CP_SAT"
+
+
+def test_config_highs_solver(monkeypatch):
+    """Test HiGHS is accepted as a solver backend."""
+    monkeypatch.setenv("SOLVER", "HIGHS")
+    config = Config()
+    assert config.solver == "HIGHS"
+
+
 def test_config_log_level_validation(monkeypatch):
     """Test log level validation."""
     monkeypatch.setenv("LOG_LEVEL", "INVALID_LEVEL")
@@ -52,6 +66,20 @@ def test_config_environment_variables(monkeypatch):
     assert config.data_dir == Path("/custom/path")
 
 
+def test_config_cache_dir(monkeypatch):
+    """Test workbook cache directory and NO_CACHE toggle."""
+    monkeypatch.setenv("CACHE_DIR", "/custom/cache")
+    assert Config().cache_dir == Path("/custom/cache")
+
+    monkeypatch.setenv("NO_CACHE", "1")
+    assert Config().cache_dir is None
+
+
+def test_config_instance():
+    """Test the shared configuration instance is reused."""
+    assert Config.instance() is Config.instance()
+
+
 def test_setup_logging():
     """Test logging setup."""
     Config.setup_logging("INFO")
@@ -125,6 +125,7 @@ def test_load_data_with_avoidance(
     assert len(data["avoidance_dict"]) > 0
     assert (1, 2) in data["avoidance_dict"]
     assert (2, 1) in data["avoidance_dict"]  # Should be symmetric
+    assert data["avoidance_pairs"] == [(1, 2)]
 
 
 def test_cost_dict_creation(data_loader, sample_cost_matrix):
@@ -148,3 +149,89 @@ def test_cost_dict_creation(data_loader, sample_cost_matrix):
     assert data["cost_dict"][(1, 1)] == 10.0
     assert (2, 2) in data["cost_dict"]
     assert data["cost_dict"][(2, 2)] == 15.0
+
+
+def test_cost_array_matches_cost_dict(data_loader, sample_mechanic_skills, sample_base_schedule, sample_cost_matrix):
+    """Test dense cost array is aligned with mechanics and bases."""
+    mechanic_skills_buffer = io.BytesIO()
+    sample_mechanic_skills.to_excel(mechanic_skills_buffer, index=False)
+    mechanic_skills_buffer.seek(0)
+
+    base_schedule_buffer = io.BytesIO()
+    sample_base_schedule.to_excel(base_schedule_buffer, index=False)
+    base_schedule_buffer.seek(0)
+
+    cost_matrix_buffer = io.BytesIO()
+    sample_cost_matrix.to_excel(cost_matrix_buffer, index=False)
+    cost_matrix_buffer.seek(0)
+
+    data = data_loader.load_data(mechanic_skills_buffer, base_schedule_buffer, cost_matrix_buffer, None)
+
+    cost_array = data["cost_array"]
+    assert cost_array.shape == (len(data["mechanics"]), len(data["bases"]))
+    for i, m in enumerate(data["mechanics"]):
+        for j, b in enumerate(data["bases"]):
+            assert cost_array[i, j] == data["cost_dict"][(m, b)]
+
+
+def test_load_data_cache(tmp_path, sample_mechanic_skills, sample_base_schedule, sample_cost_matrix):
+    """Test parsed workbooks are cached by content hash and reused."""
+    buffers = []
+    for df in (sample_mechanic_skills, sample_base_schedule, sample_cost_matrix):
+        buffer = io.BytesIO()
+        df.to_excel(buffer, index=False)
+        buffer.seek(0)
+        buffers.append(buffer)
+
+    cache_dir = tmp_path / "cache"
+    loader = DataLoader(cache_dir=cache_dir)
+    first = loader.load_data(*buffers, None)
+    assert len(list(cache_dir.glob("*.pkl"))) == 3
+
+    for buffer in buffers:
+        buffer.seek(0)
+    second = loader.load_data(*buffers, None)
+
+    assert second["mechanics"] == first["mechanics"]
+    assert second["cost_dict"] == first["cost_dict"]
+    pd.testing.assert_frame_equal(second["base_schedule_df"], first["base_schedule_df"])
+
+
+def test_load_data_cache_recovers_from_bad_entry(tmp_path, sample_mechanic_skills, sample_base_schedule, sample_cost_matrix):
+    """Test an unreadable cache entry is re-parsed and overwritten instead of failing."""
+    buffers = []
+    for df in (sample_mechanic_skills, sample_base_schedule, sample_cost_matrix):
+        buffer = io.BytesIO()
+        df.to_excel(buffer, index=False)
+        buffer.seek(0)
+        buffers.append(buffer)
+
+    cache_dir = tmp_path / "cache"
+    loader = DataLoader(cache_dir=cache_dir)
+    first = loader.load_data(*buffers, None)
+    for cache_file in cache_dir.glob("*.pkl"):
+        cache_file.write_bytes(cache_file.read_bytes()[:20])
+
+    for buffer in buffers:
+        buffer.seek(0)
+    second = loader.load_data(*buffers, None)
+
+    assert second["cost_dict"] == first["cost_dict"]
+    assert sorted(path.suffix for path in cache_dir.iterdir()) == [".pkl"] * 3
+    for cache_file in cache_dir.glob("*.pkl"):
+        pd.read_pickle(cache_file)
+
+
+def test_load_data_cache_key_includes_engine(monkeypatch, tmp_path, sample_cost_matrix):
+    """Test cached entries are not shared between Excel engines."""
+    from mechanics_roster import data_loader as data_loader_module
+
+    buffer = io.BytesIO()
+    sample_cost_matrix.to_excel(buffer, index=False)
+    loader = DataLoader(cache_dir=tmp_path)
+    for engine in ("openpyxl", "calamine"):
+        monkeypatch.setattr(data_loader_module, "EXCEL_ENGINE", engine)
+        buffer.seek(0)
+        loader._read_excel(buffer)
+
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
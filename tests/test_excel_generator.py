@@ -0,0 +1,106 @@
+"""
+Unit tests for excel_generator module.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from mechanics_roster.excel_generator import ExcelGenerator
+
+
+@pytest.fixture
+def sample_data():
+    """Create sample data and solution for testing."""
+    base_schedule_df = pd.DataFrame(
+        {
+            "base_id": [1, 1],
+            "period": [1, 2],
+            "shift": [1, 1],
+            "aw139": [1, 1],
+        }
+    )
+
+    data = {
+        "base_schedule_df": base_schedule_df,
+        "bases": [1],
+        "periods": [1, 2],
+        "shifts": [1],
+    }
+
+    mechanic_skills = {
+        1: {"aw139_af": 1, "aw139_r": 1, "aw139_av": 1},
+        2: {"aw139_af": 0, "aw139_r": 0, "aw139_av": 1},
+    }
+
+    assignments = [
+        {"mechanic_id": 1, "base_id": 1, "group": 1, "shift": 1, "shift_name": "Day", "cost": 10.0},
+        {"mechanic_id": 2, "base_id": 1, "group": 2, "shift": 1, "shift_name": "Day", "cost": 20.0},
+    ]
+
+    return data, mechanic_skills, assignments
+
+
+def _rows(output):
+    ws = load_workbook(output).active
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+def test_generate_output_rows(sample_data):
+    """Test roster rows, positions and day grid."""
+    data, mechanic_skills, assignments = sample_data
+
+    output = ExcelGenerator().generate_output(assignments, data, mechanic_skills, {}, [], data["base_schedule_df"])
+    rows = _rows(output)
+
+    assert rows[0][:6] == ["Base", "Roster", "Airframe", "Engine", "Avionics", "Position"]
+    assert rows[1][0] == "Day Shift"
+    assert rows[2][:6] == ["A", "Mechanic 1", "☑", "☑", "☑", "Mechanic"]
+    assert rows[3][:6] == ["A", "Mechanic 2", "☐", "☐", "☑", "Avionic"]
+    assert rows[2][6:] == ["☑"] * 15 + ["☐"] * 15
+    assert rows[3][6:] == ["☐"] * 15 + ["☑"] * 15
+
+
+def test_generate_output_inspector(sample_data):
+    """Test inspector position requires another mechanic with the regular skill."""
+    data, mechanic_skills, assignments = sample_data
+    data["base_schedule_df"]["aw139_av_inspec"] = [1, 0]
+    mechanic_inspector_skills = {1: {"aw139_av_inspec": 1}, 2: {"aw139_av_inspec": 1}}
+
+    output = ExcelGenerator().generate_output(
+        assignments, data, mechanic_skills, mechanic_inspector_skills, ["aw139_av_inspec"], data["base_schedule_df"]
+    )
+    rows = _rows(output)
+
+    # Both hold aw139_av, so each has another aw139_av mechanic to inspect
+    assert rows[2][5] == "Inspector"
+    assert rows[3][5] == "Inspector"
+
+    mechanic_skills[2]["aw139_av"] = 0
+    output = ExcelGenerator().generate_output(
+        assignments, data, mechanic_skills, mechanic_inspector_skills, ["aw139_av_inspec"], data["base_schedule_df"]
+    )
+    rows = _rows(output)
+
+    # Mechanic 2 can inspect mechanic 1, but mechanic 1 has nobody else to inspect
+    assert rows[2][5] == "Mechanic"
+    assert rows[3][5] == "Inspector"
+
+
+def test_generate_output_unmapped_base(sample_data):
+    """Test bases without a letter mapping are written with their id."""
+    data, mechanic_skills, assignments = sample_data
+    for assignment in assignments:
+        assignment["base_id"] = 4
+
+    output = ExcelGenerator().generate_output(assignments, data, mechanic_skills, {}, [], data["base_schedule_df"])
+    rows = _rows(output)
+
+    assert [row[0] for row in rows[2:]] == [4, 4]
@@ -13,7 +13,9 @@ sys.path.insert(0, str(src_path))
 
 import io
 
+import numpy as np
 import pandas as pd
+from ortools.linear_solver import pywraplp
 
 from mechanics_roster.data_loader import DataLoader
 from mechanics_roster.optimizer import RosterOptimizer
@@ -70,6 +72,22 @@ def optimizer():
     return RosterOptimizer(solver_name="CBC")  # Use CBC for testing (more widely available)
 
 
+@pytest.fixture
+def feasible_data(sample_data):
+    """Sample data where both periods can get an avionics mechanic."""
+    sample_data["mechanic_skills_df"]["aw139_av"] = [1, 1]
+    return sample_data
+
+
+@pytest.fixture
+def cbc_objective(feasible_data):
+    """Optimal objective of the feasible sample data, solved with CBC."""
+    optimizer = RosterOptimizer(solver_name="CBC")
+    solver, _, _, _, _, _ = optimizer.create_model(feasible_data)
+    assert optimizer.solve()[0] == pywraplp.Solver.OPTIMAL
+    return solver.Objective().Value()
+
+
 def test_optimizer_initialization(optimizer):
     """Test optimizer initialization."""
     assert optimizer.solver_name == "CBC"
@@ -91,6 +109,257 @@ def test_create_model(optimizer, sample_data):
     assert optimizer.x is not None
 
 
+def test_create_model_skips_unusable_cells(optimizer, sample_data):
+    """Test that no variables are created for mechanics without a required skill."""
+    sample_data["mechanic_skills_df"] = pd.DataFrame(
+        {
+            "mechanic_id": [1, 2, 3],
+            "aw139_af": [1, 1, 0],
+            "aw139_r": [1, 1, 0],
+            "aw139_av": [1, 0, 0],
+            "h175_af": [0, 0, 1],
+        }
+    )
+    sample_data["mechanics"] = [1, 2, 3]
+    sample_data["cost_array"] = np.array([[10.0], [20.0], [5.0]])
+
+    _, x, _, _, _, _ = optimizer.create_model(sample_data)
+
+    assert (1, 1, 1, 1) in x
+    assert not any(key[0] == 3 for key in x)
+
+
+def test_create_model_keeps_negative_cost_cells(optimizer, sample_data):
+    """Test a mechanic with a negative movement cost is assigned even without a required skill."""
+    sample_data["mechanic_skills_df"] = pd.DataFrame(
+        {
+            "mechanic_id": [1, 2, 3],
+            "aw139_af": [1, 1, 0],
+            "aw139_r": [1, 1, 0],
+            "aw139_av": [1, 1, 0],
+            "h175_af": [0, 0, 1],
+        }
+    )
+    sample_data["mechanics"] = [1, 2, 3]
+    sample_data["cost_array"] = np.array([[10.0], [20.0], [-5.0]])
+    sample_data["cost_dict"] = {(1, 1): 10.0, (2, 1): 20.0, (3, 1): -5.0}
+
+    solver, x, _, _, _, _ = optimizer.create_model(sample_data)
+    status, _ = optimizer.solve()
+
+    assert (3, 1, 1, 1) in x
+    assert status == 0
+    assert solver.Objective().Value() == 25.0
+
+
+def test_create_model_debug_names(sample_data):
+    """Test variables are only named when debug names are requested."""
+    _, x, _, _, _, _ = RosterOptimizer(solver_name="CBC").create_model(sample_data)
+    assert x[(1, 1, 1, 1)].name() != "x_m1_b1_g1_s1"
+
+    _, x, _, _, _, _ = RosterOptimizer(solver_name="CBC", debug_names=True).create_model(sample_data)
+    assert x[(1, 1, 1, 1)].name() == "x_m1_b1_g1_s1"
+
+
+def test_create_model_deduplicates_schedule(optimizer, sample_data):
+    """Test that repeated schedule rows for a cell add no extra constraints."""
+    solver, _, _, _, _, _ = optimizer.create_model(sample_data)
+    num_constraints = solver.NumConstraints()
+
+    schedule_df = sample_data["base_schedule_df"]
+    sample_data["base_schedule_df"] = pd.concat([schedule_df, schedule_df], ignore_index=True)
+    solver, _, _, _, _, _ = RosterOptimizer(solver_name="CBC").create_model(sample_data)
+
+    assert solver.NumConstraints() == num_constraints
+
+
+def test_create_model_inspector_requirements(sample_data):
+    """Test inspector constraints are only added where the requirement is positive."""
+    sample_data["mechanic_skills_df"]["aw139_av_inspec"] = [0, 1]
+    sample_data["mechanic_skills_df"]["aw139_av"] = [1, 1]
+    sample_data["base_schedule_df"]["aw139_av_inspec"] = [1, np.nan]
+
+    optimizer = RosterOptimizer(solver_name="CBC", debug_names=True)
+    solver, _, _, _, inspector_req_columns, _ = optimizer.create_model(sample_data)
+    names = [constraint.name() for constraint in solver.constraints()]
+
+    assert inspector_req_columns == ["aw139_av_inspec"]
+    assert "inspector_aw139_av_inspec_base1_period1_shift1" in names
+    assert "no_self_inspect_aw139_av_inspec_base1_period1_shift1" in names
+    assert not any(name.startswith("inspector_") and "period2" in name for name in names)
+
+
+def test_create_model_no_self_inspection_rows(sample_data):
+    """Test no-self-inspection rows are aggregated only when every inspector holds the regular skill."""
+    sample_data["mechanic_skills_df"]["aw139_av_inspec"] = [0, 1]
+    sample_data["mechanic_skills_df"]["aw139_av"] = [1, 1]
+    sample_data["base_schedule_df"]["aw139_av_inspec"] = [1, 1]
+
+    solver, _, _, _, _, _ = RosterOptimizer(solver_name="CBC", debug_names=True).create_model(sample_data)
+    constraint = {c.name(): c for c in solver.constraints()}["no_self_inspect_aw139_av_inspec_base1_period1_shift1"]
+    assert constraint.lb() == 2
+
+    # Mechanic 2 inspects without holding the regular skill: it needs mechanic 1 alongside
+    sample_data["mechanic_skills_df"]["aw139_av"] = [1, 0]
+    solver, _, _, _, _, _ = RosterOptimizer(solver_name="CBC", debug_names=True).create_model(sample_data)
+    names = [c.name() for c in solver.constraints()]
+    assert "no_self_inspect_aw139_av_inspec_base1_period1_shift1_inspector2" in names
+    assert "no_self_inspect_aw139_av_inspec_base1_period1_shift1" not in names
+
+
+def test_no_self_inspection_count_row_matches_per_inspector_rows(sample_data):
+    """Test the count row reaches the same optimum as the per-inspector rows it replaces."""
+    # Inspectors 1 and 2 hold the regular skill; mechanic 3 is a cheap holder who is not an inspector
+    sample_data["mechanic_skills_df"] = pd.DataFrame(
+        {
+            "mechanic_id": [1, 2, 3, 4],
+            "aw139_af": [1, 1, 1, 1],
+            "aw139_r": [1, 1, 1, 1],
+            "aw139_av": [1, 1, 1, 0],
+            "aw139_av_inspec": [1, 1, 0, 0],
+        }
+    )
+    sample_data["mechanics"] = [1, 2, 3, 4]
+    sample_data["cost_array"] = np.array([[10.0], [20.0], [1.0], [1.0]])
+    sample_data["base_schedule_df"] = sample_data["base_schedule_df"].iloc[:1].assign(aw139_av_inspec=1)
+    sample_data["periods"] = [1]
+
+    optimizer = RosterOptimizer(solver_name="CBC")
+    solver, _, _, _, _, _ = optimizer.create_model(sample_data)
+    assert optimizer.solve()[0] == 0
+    count_objective = solver.Objective().Value()
+
+    # Same model with the count row relaxed and x_i <= sum(other holders) added for each inspector
+    optimizer = RosterOptimizer(solver_name="CBC", debug_names=True)
+    solver, x, _, _, _, _ = optimizer.create_model(sample_data)
+    constraints = {c.name(): c for c in solver.constraints()}
+    constraints["no_self_inspect_aw139_av_inspec_base1_period1_shift1"].SetBounds(-solver.infinity(), solver.infinity())
+    holders = [1, 2, 3]
+    for inspector in (1, 2):
+        solver.Add(x[(inspector, 1, 1, 1)] <= sum(x[(m, 1, 1, 1)] for m in holders if m != inspector))
+    assert optimizer.solve()[0] == 0
+
+    assert count_objective == solver.Objective().Value() == 11.0
+
+
+def test_create_model_avoidance_pairs(optimizer, sample_data):
+    """Test that one avoidance variable is created per mechanic pair."""
+    sample_data["avoidance_dict"] = {(1, 2): 50.0, (2, 1): 50.0}
+    sample_data["avoidance_pairs"] = [(1, 2)]
+
+    _, _, _, _, _, avoidance_vars = optimizer.create_model(sample_data)
+
+    assert list(avoidance_vars.keys()) == [(1, 2)]
+
+
+def test_avoidance_pair_is_split_when_free(optimizer, sample_data):
+    """Test a penalised pair is not put in the same cell when splitting it costs nothing extra."""
+    # Mechanics 2 and 3 both cover avionics at no cost; only mechanic 2 is penalised with 1
+    sample_data["mechanic_skills_df"] = pd.DataFrame(
+        {
+            "mechanic_id": [1, 2, 3],
+            "aw139_af": [1, 0, 0],
+            "aw139_r": [1, 0, 0],
+            "aw139_av": [0, 1, 1],
+        }
+    )
+    sample_data["mechanics"] = [1, 2, 3]
+    sample_data["cost_array"] = np.array([[0.0], [0.0], [0.0]])
+    sample_data["cost_dict"] = {(1, 1): 0.0, (2, 1): 0.0, (3, 1): 0.0}
+    sample_data["base_schedule_df"] = sample_data["base_schedule_df"].iloc[:1]
+    sample_data["periods"] = [1]
+    sample_data["avoidance_dict"] = {(1, 2): 50.0, (2, 1): 50.0}
+    sample_data["avoidance_pairs"] = [(1, 2)]
+
+    solver, _, _, _, _, _ = optimizer.create_model(sample_data)
+    status, _ = optimizer.solve()
+    assignments, _ = optimizer.extract_solution(
+        sample_data["mechanics"], sample_data["bases"], sample_data["periods"], sample_data["shifts"], sample_data["cost_dict"]
+    )
+
+    assert status == 0
+    assert solver.Objective().Value() == 0
+    assert sorted(a["mechanic_id"] for a in assignments) == [1, 3]
+
+
+def test_negative_avoidance_penalty_rewards_pair(optimizer, sample_data):
+    """Test a negative penalty puts the pair together, and only when they share a cell."""
+    # Mechanic 2 or 3 can cover avionics at the same cost; pairing 1 with 2 earns the reward
+    sample_data["mechanic_skills_df"] = pd.DataFrame(
+        {
+            "mechanic_id": [1, 2, 3],
+            "aw139_af": [1, 0, 0],
+            "aw139_r": [1, 0, 0],
+            "aw139_av": [0, 1, 1],
+        }
+    )
+    sample_data["mechanics"] = [1, 2, 3]
+    sample_data["cost_array"] = np.array([[0.0], [5.0], [5.0]])
+    sample_data["cost_dict"] = {(1, 1): 0.0, (2, 1): 5.0, (3, 1): 5.0}
+    sample_data["base_schedule_df"] = sample_data["base_schedule_df"].iloc[:1]
+    sample_data["periods"] = [1, 2]
+    sample_data["avoidance_dict"] = {(1, 2): -50.0, (2, 1): -50.0}
+    sample_data["avoidance_pairs"] = [(1, 2)]
+
+    solver, _, _, _, _, _ = optimizer.create_model(sample_data)
+    status, _ = optimizer.solve()
+    assignments, _ = optimizer.extract_solution(
+        sample_data["mechanics"], sample_data["bases"], sample_data["periods"], sample_data["shifts"], sample_data["cost_dict"]
+    )
+
+    assert status == 0
+    assert solver.Objective().Value() == -45.0
+    assert sorted((a["mechanic_id"], a["group"]) for a in assignments) == [(1, 1), (2, 1)]
+    assert optimizer.extract_avoidance_penalty(assignments) == -50.0
+
+    # The reward is not collected by placing the pair in different cells
+    optimizer = RosterOptimizer(solver_name="CBC")
+    solver, x, _, _, _, _ = optimizer.create_model(sample_data)
+    solver.Add(x[(2, 1, 2, 1)] == 1)
+    status, _ = optimizer.solve()
+
+    assert status == 0
+    assert solver.Objective().Value() == 10.0
+
+
+def test_create_model_skips_avoidance_pairs_without_shared_cell(optimizer, sample_data):
+    """Test no avoidance variable is created for a pair that can never share a cell."""
+    sample_data["mechanic_skills_df"] = pd.DataFrame(
+        {
+            "mechanic_id": [1, 2, 3],
+            "aw139_af": [1, 1, 0],
+            "aw139_r": [1, 1, 0],
+            "aw139_av": [1, 0, 0],
+            "h175_af": [0, 0, 1],
+        }
+    )
+    sample_data["mechanics"] = [1, 2, 3]
+    sample_data["cost_array"] = np.array([[10.0], [20.0], [5.0]])
+    sample_data["avoidance_dict"] = {(1, 2): 50.0, (2, 1): 50.0, (1, 3): 50.0, (3, 1): 50.0}
+    sample_data["avoidance_pairs"] = [(1, 2), (1, 3)]
+
+    _, _, _, _, _, avoidance_vars = optimizer.create_model(sample_data)
+
+    assert list(avoidance_vars.keys()) == [(1, 2)]
+
+
+def test_create_model_derives_avoidance_pairs(optimizer, sample_data):
+    """Test avoidance pairs are derived when the data dict does not provide them."""
+    sample_data["avoidance_dict"] = {(1, 2): 50.0, (2, 1): 50.0}
+
+    _, _, _, _, _, avoidance_vars = optimizer.create_model(sample_data)
+
+    assert list(avoidance_vars.keys()) == [(1, 2)]
+
+
+def test_create_model_derives_cost_array(optimizer, sample_data):
+    """Test movement costs are taken from cost_dict when the data dict has no cost array."""
+    solver, x, _, _, _, _ = optimizer.create_model(sample_data)
+
+    assert solver.Objective().GetCoefficient(x[(1, 1, 1, 1)]) == 10.0
+    assert solver.Objective().GetCoefficient(x[(2, 1, 2, 1)]) == 20.0
+
+
 def test_solve_model(optimizer, sample_data):
     """Test model solving."""
     optimizer.create_model(sample_data)
@@ -100,6 +369,72 @@ def test_solve_model(optimizer, sample_data):
     assert solve_time >= 0
 
 
+def test_solve_model_with_parameters(optimizer, sample_data):
+    """Test model solving with time limit, threads and MIP gap."""
+    optimizer.create_model(sample_data)
+    status, solve_time = optimizer.solve(time_limit_seconds=10, num_threads=1, relative_gap=0.01)
+
+    assert status is not None
+    assert solve_time >= 0
+
+
+def test_solve_model_cp_sat(feasible_data, cbc_objective):
+    """Test the CP-SAT backend reaches the same optimum as CBC."""
+    optimizer = RosterOptimizer(solver_name="CP_SAT")
+    solver, _, _, _, _, _ = optimizer.create_model(feasible_data)
+    status, solve_time = optimizer.solve()
+
+    assert optimizer.solver_name == "CP_SAT"
+    assert status == pywraplp.Solver.OPTIMAL
+    assert solver.Objective().Value() == cbc_objective == 30.0
+    assert solve_time >= 0
+
+
+def test_solve_model_highs(feasible_data, cbc_objective):
+    """Test the HiGHS backend reaches the same optimum as CBC."""
+    optimizer = RosterOptimizer(solver_name="HIGHS")
+    solver, _, _, _, _, _ = optimizer.create_model(feasible_data)
+    status, solve_time = optimizer.solve()
+
+    assert optimizer.solver_name == "HIGHS"
+    assert status == pywraplp.Solver.OPTIMAL
+    assert solver.Objective().Value() == cbc_objective
+    assert solve_time >= 0
+
+
+def test_solve_model_warm_start(sample_data):
+    """Test a previous solution can be passed back as a warm start hint."""
+    sample_data["base_schedule_df"] = sample_data["base_schedule_df"].iloc[:1]
+    sample_data["periods"] = [1]
+
+    optimizer = RosterOptimizer(solver_name="SCIP")
+    optimizer.create_model(sample_data)
+    status, _ = optimizer.solve()
+    assert status == 0
+    assignments, total_cost = optimizer.extract_solution(
+        sample_data["mechanics"], sample_data["bases"], sample_data["periods"], sample_data["shifts"], sample_data["cost_dict"]
+    )
+
+    optimizer = RosterOptimizer(solver_name="SCIP")
+    optimizer.create_model(sample_data)
+    status, _ = optimizer.solve(warm_start=assignments)
+
+    assert status == 0
+    assert optimizer.solver.Objective().Value() == total_cost
+
+
+def test_solve_model_warm_start_highs(caplog, feasible_data, cbc_objective):
+    """Test HiGHS skips the warm start hint, which would crash it, and solves from scratch."""
+    optimizer = RosterOptimizer(solver_name="HIGHS")
+    solver, _, _, _, _, _ = optimizer.create_model(feasible_data)
+    with caplog.at_level("WARNING"):
+        status, _ = optimizer.solve(warm_start=[{"mechanic_id": 1, "base_id": 1, "group": 1, "shift": 1}])
+
+    assert "HIGHS does not support warm start hints" in caplog.text
+    assert status == pywraplp.Solver.OPTIMAL
+    assert solver.Objective().Value() == cbc_objective
+
+
 def test_extract_solution(optimizer, sample_data):
     """Test solution extraction."""
     optimizer.create_model(sample_data)
@@ -119,6 +454,37 @@ def test_extract_solution(optimizer, sample_data):
         assert total_cost >= 0
 
 
+def test_extract_avoidance_penalty(optimizer, sample_data):
+    """Test avoidance penalty of a pair forced into the same cell."""
+    sample_data["mechanic_skills_df"] = pd.DataFrame(
+        {
+            "mechanic_id": [1, 2],
+            "aw139_af": [1, 0],
+            "aw139_r": [1, 0],
+            "aw139_av": [0, 1],
+        }
+    )
+    sample_data["base_schedule_df"] = sample_data["base_schedule_df"].iloc[:1]
+    sample_data["periods"] = [1]
+    sample_data["avoidance_dict"] = {(1, 2): 50.0, (2, 1): 50.0}
+    sample_data["avoidance_pairs"] = [(1, 2)]
+
+    optimizer.create_model(sample_data)
+    status, _ = optimizer.solve()
+
+    assignments, _ = optimizer.extract_solution(
+        sample_data["mechanics"], sample_data["bases"], sample_data["periods"], sample_data["shifts"], sample_data["cost_dict"]
+    )
+
+    assert status == 0
+    assert optimizer.avoidance_vars[(1, 2)].solution_value() == 1.0
+    assert optimizer.extract_avoidance_penalty(assignments) == 50.0
+
+    # Only pairs actually sharing a cell count, whatever the avoidance variables say
+    split = [dict(a, group=a["group"] + a["mechanic_id"]) for a in assignments]
+    assert optimizer.extract_avoidance_penalty(split) == 0.0
+
+
 def test_solve_without_model(optimizer):
     """Test that solving without creating model raises error."""
     with pytest.raises(ValueError, match="Model must be created"):